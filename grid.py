@@ -1,10 +1,15 @@
 import types
-import dataclasses
 import enum
-from typing import NamedTuple, Generator, Any
+import heapq
+import itertools
+import math
+import operator
+import contextlib
+from typing import NamedTuple, Generator, Iterable, Any
 from dearpygui import dearpygui as dpg
 from dearpygui._dearpygui import (
     get_item_configuration,
+    get_item_state,
     configure_item,
 )
 
@@ -63,61 +68,123 @@ class GridItem(NamedTuple):
     anchor : str             = ""
 
 
-@dataclasses.dataclass(slots=True)
-class GridSeries:
-    """Information regarding a grid's row or column."""
+class GridAxis:
+    """Information regarding a grid's rows or columns. The settings of each series are
+    stored in parallel lists indexed by the series' index.
+    """
+    __slots__ = ("_weights", "_sizes", "_weight", "_min_size")
+
     _WEIGHT  = 1.0
     _MINSIZE = 0
 
-    weight: float = _WEIGHT
-    size  : int   = _MINSIZE
-
-    def configure(self, *, weight: float = None, size: int = None, **kwargs) -> None:
-        if weight is not None:
-            self.weight = max(0, weight)
-        if size is not None:
-            self.size = max(0, size)
+    def __init__(self, length: int):
+        self._weights: list[float] = []
+        self._sizes  : list[int]   = []
+        # Cached sums of the axis. A value of None means it's stale and will be
+        # recalculated on the next read.
+        self._weight  : float | None = None
+        self._min_size: int   | None = None
+        self.resize(length)  # populate lists
 
-    def configuration(self) -> dict[str, Any]:
-        return dataclasses.asdict(self)
+    def __len__(self) -> int:
+        return self._weights.__len__()
 
+    def configure(self, index: int, *, weight: float = None, size: int = None) -> None:
+        """Update the configuration of the series at *index*.
 
-class GridAxis:
-    __slots__ = ("_axis",)
-
-    _WEIGHT  = GridSeries._WEIGHT
-    _MINSIZE = GridSeries._MINSIZE
+        Args:
+            * index (int): Target series index.
 
-    def __init__(self, length: int):
-        self._axis: list[GridSeries] = []
-        self.resize(length)  # populate list
+            * weight (float, optional): The series' weight. A value less than 0 is treated
+            as 0.
 
-    def __getitem__(self, index: int) -> GridSeries:
-        return self._axis[index]
+            * size (int, optional): The series' fixed size. A value less than 0 is treated
+            as 0.
+        """
+        if weight is not None:
+            self._weights[index] = max(0, weight)
+        if size is not None:
+            self._sizes[index] = max(0, size)
+        self._weight   = None
+        self._min_size = None
 
-    def __iter__(self) -> Generator[GridSeries, None, None]:
-        yield from self._axis
+    def configuration(self, index: int) -> dict[str, Any]:
+        """Return the configuration of the series at *index*.
 
-    def __len__(self) -> int:
-        return self._axis.__len__()
+        Args:
+            * index (int): Target series index.
+        """
+        return {"weight": self._weights[index], "size": self._sizes[index]}
 
-    def resize(self, amount: int) -> None:
+    def resize(self, length: int) -> None:
         """Args:
-            * amount (int): If the number is positive, a new GridSeries object is appended
-            to the array based on the value. If negative, the array will be trimmed from the
-            end by that many values.
+            * length (int): The new number of series in the axis. Series using the default
+            settings are appended to grow the axis, or it is trimmed from the end to shrink it.
         """
-        arr = self._axis
-        if amount >= len(arr):
-            arr.extend((GridSeries() for _ in range(amount)))
+        weights = self._weights
+        sizes   = self._sizes
+        if length > len(weights):
+            count = length - len(weights)
+            weights.extend([self._WEIGHT]  * count)
+            sizes.extend([self._MINSIZE] * count)
         else:
-            del arr[-1: (amount-1): -1]  # trim in-place
+            del weights[length:]  # trim in-place
+            del sizes[length:]
+        self._weight   = None
+        self._min_size = None
 
     def get_weight(self) -> float:
-        return sum(s.weight for s in self._axis if not s.size)
+        if self._weight is None:
+            self._weight = sum(w for w, s in zip(self._weights, self._sizes) if not s)
+        return self._weight
 
     def get_min_size(self) -> int:
-        return sum(s.size for s in self._axis)
+        if self._min_size is None:
+            self._min_size = sum(self._sizes)
+        return self._min_size
+
+    def get_sizes(self, space: int) -> list[int]:
+        """Return the size of every series in the axis, in whole pixels. A series with a
+        set size value will not auto-size with the grid. The others split *space*
+        proportional to their individual weight values.
+
+        The space is apportioned using Webster's (Sainte-Lague) method: pixels are
+        handed out one at a time to the series with the highest `weight / (size + 0.5)`,
+        equal priorities going to the lower index. That order doesn't depend on *space*,
+        so the shares always add up to exactly *space* and growing *space* never shrinks
+        a series. Otherwise, series would jitter by a pixel back and forth while the
+        target is being resized.
+
+        Args:
+            * space (int): The amount of space to distribute between weighted series.
+        """
+        sizes = self._sizes.copy()
+        total = self.get_weight()
+        space = int(space)
+        if space <= 0 or not total:
+            return sizes
+        weights = self._weights
+        flex    = [i for i, size in enumerate(sizes) if not size and weights[i]]
+        # Handing out every pixel individually is slow for large targets. Instead, each
+        # series starts at a lower bound of its final size, which can only fall short of
+        # its exact share by `weight * len(flex) / (2 * total) + 0.5` (and a couple of
+        # pixels are spared for float error). Only the remaining handful of pixels go
+        # through the queue.
+        quota = (space - len(flex) / 2) / total
+        for i in flex:
+            size = int(weights[i] * quota - 0.5) - 2
+            sizes[i] = size if size > 0 else 0
+        # A pixel's priority only depends on its series and the size it grows it to, not
+        # on *space*, so the queue always yields pixels in the same order. Don't round
+        # the shares up front -- float error there would tip exact ties one way or the
+        # other depending on *space*, which is what makes series jitter.
+        queue = [(-weights[i] / (sizes[i] + 0.5), i) for i in flex]
+        heapq.heapify(queue)
+        for _ in range(space - sum(sizes[i] for i in flex)):
+            _, i = heapq.heappop(queue)
+            sizes[i] += 1
+            heapq.heappush(queue, (-weights[i] / (sizes[i] + 0.5), i))
+        return sizes
 
 
 class Grid:
@@ -136,13 +203,23 @@ class Grid:
     """
 
     __slots__ = (
-        "items",
         "_items",
+        "_items_view",
         "_target",
         "_spacing",
         "_padding",
         "_rows",
         "_cols",
+        "_row_count",
+        "_col_count",
+        "_layout_key",
+        "_spans",
+        "_spans_key",
+        "_packed",
+        "_dirty",
+        "_applied",
+        "_batch_depth",
+        "_redraw_frame",
     )
 
     def __init__(self, target: ItemId, *, cols: int = 1, rows: int = 1, spacing: Point = (0, 0), padding: Point = (0, 0)):
@@ -171,11 +248,39 @@ class Grid:
         # through their actual index.
         self._rows = GridAxis(rows)
         self._cols = GridAxis(cols)
+        # Lengths of the above. Only `configure_grid` resizes the axes.
+        self._row_count = rows
+        self._col_count = cols
 
         self._items: dict[ItemId, GridItem] = {}
-        self.items = types.MappingProxyType(self._items)
+        self._items_view: types.MappingProxyType | None = None  # created on first access
+        # Flat (item, r1, c1, r2, c2, width, height, align) records of `_items`
+        # for redraw to iterate, with indexes normalized to the current row/column
+        # counts. Rebuilt on the next redraw when set to None.
+        self._packed: dict[ItemId, tuple] | None = None
+        # Items packed since the last redraw. If nothing else changed, only these
+        # need to be laid out.
+        self._dirty: set[ItemId] = set()
+
+        # The (pos, width, height) last sent to DPG for each item.
+        self._applied: dict[ItemId, tuple[tuple[int, int], int, int]] = {}
+
+        # Number of active `batch` blocks. The grid doesn't redraw while above 0.
+        self._batch_depth = 0
+        # The frame `redraw_async` last scheduled a redraw for, until that redraw runs.
+        self._redraw_frame: int | None = None
+
+        # The target's (width, height) as of the last redraw. Anything that affects the
+        # layout of every item resets this to None so the next redraw lays out all of them.
+        self._layout_key: tuple[int, int] | None = None
+        # Row/column spans from the last redraw and the target size they were computed
+        # for. Only changes to the grid itself (not packing) reset this to None.
+        self._spans    : tuple[list[tuple[int, int]], list[tuple[int, int]]] | None = None
+        self._spans_key: tuple[int, int] | None = None
 
     def __setitem__(self, index: tuple[int, int], item: int) -> None:
+        if type(index) is not tuple:
+            raise TypeError(f"Grid indexes should be a tuple of (row, col) or (r1, c1, r2, c2) (got {type(index)}).")
         self.pack(item, *index)
 
     @property
@@ -183,11 +288,18 @@ class Grid:
         """[get]: The item that the grid scales to."""
         return self._target
 
+    @property
+    def items(self) -> types.MappingProxyType:
+        """[get]: A read-only mapping of the items managed by the grid."""
+        if self._items_view is None:
+            self._items_view = types.MappingProxyType(self._items)
+        return self._items_view
+
     @property
     def rows(self) -> int:
         """[get, set]: The number of rows in the grid. Cannot be set below 1.
         """
-        return len(self._rows)
+        return self._row_count
     @rows.setter
     def rows(self, value: int) -> None:
         self.configure_grid(rows=value)
@@ -196,7 +308,7 @@ class Grid:
     def cols(self) -> int:
         """[get, set]: The number of columns in the grid. Cannot be set below 1.
         """
-        return len(self._cols)
+        return self._col_count
     @cols.setter
     def cols(self, value: int) -> None:
         self.configure_grid(cols=value)
@@ -245,13 +357,19 @@ class Grid:
         # TODO: Get noisy when a user tries to trim the grid while items
         # occupy the space.
         if rows > 0:
-            self._rows.resize(rows - len(self._rows))
+            self._rows.resize(rows)
+            self._row_count = rows
+            self._packed    = None  # normalized indexes are stale
         if cols > 0:
-            self._cols.resize(cols - len(self._cols))
+            self._cols.resize(cols)
+            self._col_count = cols
+            self._packed    = None
         if padding:
             self._padding = Point(*padding)
         if spacing:
             self._spacing = Point(*spacing)
+        self._spans      = None
+        self._layout_key = None
         # self.redraw()?
 
     def configure_col(
@@ -275,7 +393,9 @@ class Grid:
             * width (int): The width of the column. A value less than 0 is treated as
             0.
         """
-        self._cols[index].configure(weight=weight, size=width)
+        self._cols.configure(index, weight=weight, size=width)
+        self._spans      = None
+        self._layout_key = None
         # self.redraw()?
 
     def configure_row(
@@ -299,7 +419,9 @@ class Grid:
             * height (int): The minimum height of the row. A value less than 0 is treated
             as 0.
         """
-        self._rows[index].configure(weight=weight, size=height)
+        self._rows.configure(index, weight=weight, size=height)
+        self._spans      = None
+        self._layout_key = None
         # self.redraw()?
 
     def get_col_configuration(self, index: int):
@@ -308,7 +430,7 @@ class Grid:
         Args:
             * index (int): Target column index.
         """
-        return self._cols[index].configuration()
+        return self._cols.configuration(index)
 
     def get_row_configuration(self, index: int):
         """Return the configuration of a specified row.
@@ -316,7 +438,7 @@ class Grid:
         Args:
             * index (int): Target row index.
         """
-        return self._rows[index].configuration()
+        return self._rows.configuration(index)
 
     def pack(
         self,
@@ -369,39 +491,48 @@ class Grid:
             Accepted values are 'n', 'ne', 'e', 'se', 's', 'sw', 'w', 'nw', and 'c'. Not case-
             sensitive. Defaults to 'nw'.
         """
-        rows = self._rows
-        cols = self._cols
-        # validate indexes
-        try:
-            rows[r1]
-            rows[c1]
-            cols[r2 or 0]
-            cols[c2 or 0]
-        except IndexError:
-            raise IndexError("Index(s) outside of grid range.") from None
+        r_count = self._row_count
+        c_count = self._col_count
+        # validate indexes -- non-integers are rejected here, before anything is stored
+        r1 = operator.index(r1)
+        c1 = operator.index(c1)
+        if r2 is not None:
+            r2 = operator.index(r2)
+        if c2 is not None:
+            c2 = operator.index(c2)
+        if (
+            not -r_count <= r1 < r_count
+            or not -c_count <= c1 < c_count
+            or (r2 is not None and not -r_count <= r2 < r_count)
+            or (c2 is not None and not -c_count <= c2 < c_count)
+        ):
+            raise IndexError("Index(s) outside of grid range.")
         # Normalizing indexes. -1 needs to be preserved for redraws so the item
         # will always be positioned at the last series of the axis, even if the
         # number of series changes.
-        r_count = len(rows)
-        c_count = len(cols)
         r1 = r1 % r_count if r1 != -1 else r1
         c1 = c1 % c_count if c1 != -1 else c1
-        if r2 is not None:
-            r2 = r2 % r_count if r2 != -1 else r2
-        else:
+        if r2 is None and c2 is None:
+            # Single cell (the common case) -- there's no range to normalize or correct.
             r2 = r1
-        if c2 is not None:
-            c2 = c2 % c_count if c2 != -1 else c2
-        else:
             c2 = c1
-        # Correct a backwards anchor or negative range.
-        if r1 > r2 and r2 != -1:
-            r1, r2 = r2, r1
-        if c1 > c2 and c2 != -1:
-            c1, c2 = c2, c1
-
-        max_width  = 0 if max_width  < 0 else max_width
-        max_height = 0 if max_height < 0 else max_height
+        else:
+            if r2 is not None:
+                r2 = r2 % r_count if r2 != -1 else r2
+            else:
+                r2 = r1
+            if c2 is not None:
+                c2 = c2 % c_count if c2 != -1 else c2
+            else:
+                c2 = c1
+            # Correct a backwards anchor or negative range.
+            if r1 > r2 and r2 != -1:
+                r1, r2 = r2, r1
+            if c1 > c2 and c2 != -1:
+                c1, c2 = c2, c1
+
+        max_width  = 0 if max_width  < 0 else int(max_width)
+        max_height = 0 if max_height < 0 else int(max_height)
 
         try:
             anchor = anchor.lower() if anchor else "nw"
@@ -411,111 +542,254 @@ class Grid:
             raise ValueError(f"Accepted `anchor` values; 'n', 'ne', 'e', 'se', 's', 'sw', 'w', 'nw', 'c' (got {anchor!r}).")
 
         self._items[item] = GridItem(item, (r1, c1), (r2, c2), max_width, max_height, anchor)
+        self._dirty.add(item)
         self.redraw()
 
-    def redraw(self, *args, **kwargs) -> None:
-        """Force the grid to recalculate the positions and sizes of all managed
-        items.
+    @contextlib.contextmanager
+    def batch(self) -> Generator["Grid", None, None]:
+        """Defer redraws until the end of the block, where the grid is redrawn once.
+        Useful when packing many items or reconfiguring the grid at once, e.g. while
+        building the UI. Redraws requested inside of the block (by packing, resize
+        callbacks, etc.) are dropped in favor of that one. Blocks can be nested; only
+        the outermost one will redraw.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+        if not self._batch_depth:
+            self.redraw()
+
+    def redraw(self, *args, width: int = None, height: int = None, force: bool = False, **kwargs) -> None:
+        """Recalculate the positions and sizes of all managed items.
 
         Ideally, this should be passed as a resize callback for the target item
         or viewport.
+
+        Items are only reconfigured when their computed position or size differs
+        from what the grid last set. Nothing is done at all if neither the target's
+        size nor the grid have changed since the last redraw, unless *force* is set.
+
+        Args:
+            * width (int, optional): The target item's current width. When both
+            *width* and *height* are known, passing them skips querying the target.
+
+            * height (int, optional): The target item's current height.
+
+            * force (bool, optional): Lay out and reconfigure every item even if
+            nothing seems to have changed (e.g. after an item was moved outside of
+            the grid).
         """
-        # This would be a good spot to lock DearPyGui's mutex but that's the application's
-        # responsibility, not the grid's.
-        ANCHORS = self.ANCHORS
-        cells   = self._get_cells()
-        row_cnt = len(self._rows)
-        col_cnt = len(self._cols)
-        for item, (r1, c1), (r2, c2), item_width, item_height, anchor, *_ in self._items.values():
-            x_pos , y_pos , width1, height1 = cells[(r1 % row_cnt, c1 % col_cnt)]  # normalizing idxs
-            x_offs, y_offs, width2, height2 = cells[(r2 % row_cnt, c2 % col_cnt)]  # normalizing idxs
+        if force:
+            # Lay out every item, and forget what was set -- the items may have been
+            # moved since. Inside of a batch, this carries over to the redraw on exit.
+            self._layout_key = None
+            self._applied.clear()
+        if self._batch_depth:
+            return  # the outermost `batch` block will redraw on exit
+        if width is None or height is None:
+            target_size = self._get_target_size()
+        else:
+            target_size = (width, height)
+        # The target hasn't been laid out by DPG yet -- there's nothing to scale to.
+        # The first resize event will redraw the grid.
+        if not target_size[0] or not target_size[1]:
+            return
+        dirty = self._dirty
+        # If neither the target's size nor the grid have changed since the last redraw,
+        # only newly packed items (if any) need a layout. Otherwise, everything does.
+        relayout = target_size != self._layout_key
+        if not relayout and not dirty:
+            return  # i.e. a spurious resize event
+
+        spans   = self._spans
+        if spans is None or target_size != self._spans_key:
+            spans = self._spans = self._get_spans(*target_size)
+            self._spans_key = target_size
+        row_spans, col_spans = spans
+        packed = self._packed
+        if packed is None:
+            packed = self._packed = self._get_records(self._items.values())
+            relayout = True
+        elif dirty:
+            packed.update(self._get_records(self._items[item] for item in dirty))
+        records = packed.values() if relayout else [packed[item] for item in dirty]
+
+        # Layout math and DPG calls are kept in separate passes so the latter is a tight
+        # loop of nothing but `configure_item` calls.
+        applied = self._applied
+        updates = []
+        append  = updates.append
+        for item, r1, c1, r2, c2, item_width, item_height, (x_align, y_align) in records:
+            # A cell's rect is just its row's span paired with its column's span.
+            y_pos , height1 = row_spans[r1]
+            x_pos , width1  = col_spans[c1]
+            y_offs, height2 = row_spans[r2]
+            x_offs, width2  = col_spans[c2]
             # Adjust the dimensions for "merged" cells.
             cell_width  = x_offs + width2  - x_pos
             cell_height = y_offs + height2 - y_pos
             # Sizing item to fit the cell space.
-            if not item_width or item_width > cell_width:
+            if item_width > cell_width:
                 item_width = cell_width
-            if not item_height or item_height > cell_height:
+            if item_height > cell_height:
                 item_height = cell_height
-            configure_item(
-                item,
-                # anchor funcs don't do much unless the item is smaller than the cell
-                pos=ANCHORS[anchor](item_width, item_height, x_pos, y_pos, cell_width, cell_height),
+            rect = (
+                # anchors don't do much unless the item is smaller than the cell
+                (
+                    x_pos + int((cell_width  - item_width ) * x_align),
+                    y_pos + int((cell_height - item_height) * y_align),
+                ),
                 # Due to how DPG interprets size values, the width/height cannot be
                 # lower than 1 as it would actually make the item larger...
-                width=max(int(item_width), 1),
-                height=max(int(item_height), 1),
+                item_width  if item_width  > 1 else 1,
+                item_height if item_height > 1 else 1,
             )
+            # Small changes to the target's size often don't move an item by a whole
+            # pixel. Those items are already where they need to be.
+            if applied.get(item) != rect:
+                append((item, rect))
+
+        # Holding DPG's (recursive) mutex for the whole pass means each `configure_item`
+        # call re-enters a lock this thread already owns instead of contending for it,
+        # and a frame is never rendered with the grid half-updated.
+        _configure_item = configure_item
+        with dpg.mutex():
+            for item, rect in updates:
+                pos, width, height = rect
+                _configure_item(item, pos=pos, width=width, height=height)
+                # Only recorded once DPG has it, so a failed call doesn't leave the
+                # items after it marked as up to date.
+                applied[item] = rect
+        # Only remembered once every item is updated. If a `configure_item` call raises,
+        # the next redraw tries again instead of being skipped.
+        self._layout_key = target_size
+        dirty.clear()
+
+    def redraw_async(self, *args, **kwargs) -> None:
+        """Like `redraw`, but lays out the grid on the next frame instead of right
+        away. Any number of calls before then result in a single redraw, so this is
+        useful as a resize callback for targets that resize many times per frame.
+
+        This uses DPG's frame callback for the next frame, which replaces any other
+        callback set for that frame.
+        """
+        frame = dpg.get_frame_count()
+        # Already scheduled -- unless that frame came and went without the redraw
+        # running (e.g. another callback replaced it), in which case it's rescheduled.
+        if self._redraw_frame is not None and frame <= self._redraw_frame:
+            return
+        dpg.set_frame_callback(frame + 1, self._redraw_frame_cb)
+        self._redraw_frame = frame + 1
+
+    def redraw_viewport(self, sender: Any = None, app_data: Any = None, *args) -> None:
+        """A `redraw` for use as the viewport's resize callback when the target is
+        the primary window. The window fills the viewport's client area, so its
+        size is read from the callback's *app_data* instead of querying the target.
+
+        Args:
+            * sender (Any, optional): Ignored.
+
+            * app_data (Any, optional): The viewport's (width, height, client_width,
+            client_height) as passed to resize callbacks. When not available, the
+            target is queried as usual.
+        """
+        if app_data and len(app_data) >= 4:
+            self.redraw(width=app_data[2], height=app_data[3])
+        else:
+            self.redraw()
 
+    # How far into the leftover cell space (horizontally, vertically) an item is
+    # placed for each anchor -- 0 is the cell's top/left edge, 1 its bottom/right.
     ANCHORS = {
-        "n" : lambda i_wt, i_ht, c_x, c_y, c_wt, c_ht: (int((c_wt - i_wt) / 2 + c_x), int(                    c_y)),  # center x
-        "ne": lambda i_wt, i_ht, c_x, c_y, c_wt, c_ht: (int((c_wt - i_wt)     + c_x), int(                    c_y)),
-        "e" : lambda i_wt, i_ht, c_x, c_y, c_wt, c_ht: (int((c_wt - i_wt)     + c_x), int((c_ht - i_ht) / 2 + c_y)),  # center y
-        "se": lambda i_wt, i_ht, c_x, c_y, c_wt, c_ht: (int((c_wt - i_wt)     + c_x), int((c_ht - i_ht)     + c_y)),
-        "s" : lambda i_wt, i_ht, c_x, c_y, c_wt, c_ht: (int((c_wt - i_wt) / 2 + c_x), int((c_ht - i_ht)     + c_y)),  # center x
-        "sw": lambda i_wt, i_ht, c_x, c_y, c_wt, c_ht: (int(                    c_x), int((c_ht - i_ht)     + c_y)),
-        "w" : lambda i_wt, i_ht, c_x, c_y, c_wt, c_ht: (int(                    c_x), int((c_ht - i_ht) / 2 + c_y)),  # center y
-        "nw": lambda i_wt, i_ht, c_x, c_y, c_wt, c_ht: (int(                    c_x), int(                    c_y)),
-        "c" : lambda i_wt, i_ht, c_x, c_y, c_wt, c_ht: (int((c_wt - i_wt) / 2 + c_x), int((c_ht - i_ht) / 2 + c_y)),  # center x & y
+        "n" : (0.5, 0.0),  # center x
+        "ne": (1.0, 0.0),
+        "e" : (1.0, 0.5),  # center y
+        "se": (1.0, 1.0),
+        "s" : (0.5, 1.0),  # center x
+        "sw": (0.0, 1.0),
+        "w" : (0.0, 0.5),  # center y
+        "nw": (0.0, 0.0),
+        "c" : (0.5, 0.5),  # center x & y
     }
 
     #### INTERNAL/PRIVATE ####
 
-    def _get_cells(self) -> dict[Point, Rect]:
-        """Return the coordinates and bounding boxes of all cells in the grid."""
+    def _get_records(self, items: Iterable[GridItem]) -> dict[ItemId, tuple]:
+        """Return redraw's flat (item, r1, c1, r2, c2, width, height, align) records
+        for the given items.
+
+        Args:
+            * items (Iterable[GridItem]): Items managed by the grid.
+        """
+        # Anything that is constant between packs is resolved here once rather than
+        # per item, per redraw (e.g. looking up the anchor's alignment).
+        # Indexes are normalized against the current row/column counts too (-1 is kept
+        # in `_items` so it can follow the last series when the grid is resized), and
+        # an unbounded size (0) becomes infinity so sizing is a single comparison.
+        ANCHORS = self.ANCHORS
+        INF     = math.inf
+        row_cnt = self._row_count
+        col_cnt = self._col_count
+        return {
+            item: (item, r1 % row_cnt, c1 % col_cnt, r2 % row_cnt, c2 % col_cnt, width or INF, height or INF, ANCHORS[anchor])
+            for item, (r1, c1), (r2, c2), width, height, anchor in items
+        }
+
+    def _redraw_frame_cb(self, *args) -> None:
+        """Frame callback scheduled by `redraw_async`."""
+        self._redraw_frame = None
+        self.redraw()
+
+    def _get_target_size(self) -> tuple[int, int]:
+        """Return the width and height of the target item."""
+        # `rect_size` is the size DPG actually laid the target out with, and the item's
+        # state is a much smaller dict to build than its configuration. It's only valid
+        # once the target has been rendered though, so fall back to the configured size
+        # before then.
+        width, height = get_item_state(self._target).get("rect_size", (0, 0))
+        if not width or not height:
+            target_cfg = get_item_configuration(self._target)
+            width, height = target_cfg["width"], target_cfg["height"]
+        return width, height
+
+    def _get_spans(self, width: int, height: int) -> tuple[list[tuple[int, int]], list[tuple[int, int]]]:
+        """Return the (position, size) spans of the cells in every row and column of
+        the grid. The rect of the cell at (row, col) is (col_x, row_y, col_width, row_height).
+
+        Spans are computed per-axis, so there's no table of all rows * cols cells to
+        build when only a handful of them are ever occupied.
+
+        Args:
+            * width (int): Width of the target item.
+
+            * height (int): Height of the target item.
+        """
         # Performance matters here -- localizing as many common vars
         # outside of loops as possible while minimizing function calls.
 
         # content region #
-        _item_cfg = get_item_configuration(self._target)
         cont_x_pos, cont_y_pos = self._padding   # item relative coords -- always 0 + padding
-        cont_width  = (_item_cfg["width" ] - cont_x_pos - cont_x_pos)
-        cont_height = (_item_cfg["height"] - cont_y_pos - cont_y_pos)
-
-        # This will be distributed between rows/columns proportional to their
-        # individial weight values.
-        unalloc_width  = max(0, cont_width  - self._cols.get_min_size())
-        unalloc_height = max(0, cont_height - self._rows.get_min_size())
-        # The pixel value each "weight" is worth from the remaining space.
-        width_per_weight  = unalloc_width  / (self._cols.get_weight() or 1)  # ZeroDivisionError
-        height_per_weight = unalloc_height / (self._rows.get_weight() or 1)  # ZeroDivisionError
+        cont_width  = (width  - cont_x_pos - cont_x_pos)
+        cont_height = (height - cont_y_pos - cont_y_pos)
 
         # cell rect stuff -- each cell is responsible for half of the spacing
         x_spacing, y_spacing = self._spacing
         cell_x_pad = x_spacing / 2
         cell_y_pad = y_spacing / 2
 
-        rows = self._rows
-        cols = [*enumerate(self._cols)]
-
-        cells = {}
-        cumulative_height = 0.0
-        for row, row_cfg in enumerate(rows):
-            # A series with a set size value will not auto-size with the grid.
-            row_height = row_cfg.size or height_per_weight * row_cfg.weight
-            # cell rect (vertical)
-            cell_y_pos  = cont_y_pos + cumulative_height + cell_y_pad
-            cell_height = row_height - y_spacing
-
-            cumulative_width = 0.0
-            for col, col_cfg in cols:
-                # A series with a set size value will not auto-size with the grid.
-                col_width = col_cfg.size or width_per_weight * col_cfg.weight
-                # cell rect (horizontal)
-                cell_x_pos = cont_x_pos + cumulative_width + cell_x_pad
-                cell_width = col_width - x_spacing
-
-                cumulative_width += col_width
-
-                cells[(row, col)] = Rect(
-                    cell_x_pos,
-                    cell_y_pos,
-                    cell_width,
-                    cell_height,
-                )
-
-            cumulative_height += row_height
-        return cells
+        # The size and offset of a series is the same for every cell in it, so they're
+        # only computed once per axis (prefix sums) instead of once per cell. Whatever
+        # space the sized series don't use is distributed between the others.
+        row_heights = self._rows.get_sizes(cont_height - self._rows.get_min_size())
+        col_widths  = self._cols.get_sizes(cont_width  - self._cols.get_min_size())
+        row_edges = [*map(int, itertools.accumulate(row_heights, initial=cont_y_pos))]
+        col_edges = [*map(int, itertools.accumulate(col_widths,  initial=cont_x_pos))]
+        # Spans are whole pixels as well, so redraw doesn't need to convert them per item.
+        row_spans = [(int(y1 + cell_y_pad), int(y2 - y1 - y_spacing)) for y1, y2 in itertools.pairwise(row_edges)]
+        col_spans = [(int(x1 + cell_x_pad), int(x2 - x1 - x_spacing)) for x1, x2 in itertools.pairwise(col_edges)]
+        return row_spans, col_spans
 
 
 if __name__ == '__main__':
@@ -553,40 +827,43 @@ if __name__ == '__main__':
     with dpg.window(no_scrollbar=True, no_background=True) as win:
         grid = Grid(win, cols=6, rows=6, padding=(5, 5), spacing=(5, 5))
 
-        # Without additional arguments, items will expand and shrink to the cell's size.
-        grid.pack(create_button(),  0,  2)  # first row
-        grid.pack(create_button(), -1,  3)  # last row
-
-        # You can clamp an item's width/height and include an alignment option. Valid
-        # options are 'n', 'ne', 'e', 'se', 's', 'sw', 'w', 'nw', and 'c'.
-        grid.pack(create_button(), 1, 1, max_height=25, anchor="w")  # west (centered)
-        grid.pack(create_button(), 1, 1, max_width=25, anchor="n")   # north (centered)
-        grid.pack(create_button(), 4, 4, max_height=25, anchor="w")
-
-        # These items will occupy a range of cells.
-        grid.pack(create_button(),  3,  1,  4,  2)
-        grid.pack(create_button(),  1,  3,  2,  4)
-        grid.pack(create_button(),  4,  0, -1,  1)
-        grid.pack(create_button(),  0,  4,  1, -1)
-
-        for anchor in grid.ANCHORS:  # '
-            kwargs = dict(max_width=50, max_height=50, anchor=anchor)
-            # pack to individual cells (cont.)
-            grid.pack(create_button(),  0,  0, **kwargs)  # first row & column
-            grid.pack(create_button(), -1, -1, **kwargs)  # last row & column
-            # pack to a "merged cell" (cont.)
-            grid.pack(create_button(),  2,  2,  3,  3, **kwargs)
-
-        # You can change the weight or set a fixed size for a row/column.
-        grid.configure_col(2, weight=0.5)  # |
-        grid.configure_col(3, weight=0.5)  # |-- These middle rows and columns will scale
-        grid.configure_row(2, weight=0.5)  # |-- to half the size of other rows/columns.
-        grid.configure_row(3, weight=0.5)  # |
+        # Packing within a batch only lays out the grid once, when the block exits.
+        with grid.batch():
+            # Without additional arguments, items will expand and shrink to the cell's size.
+            grid.pack(create_button(),  0,  2)  # first row
+            grid.pack(create_button(), -1,  3)  # last row
+
+            # You can clamp an item's width/height and include an alignment option. Valid
+            # options are 'n', 'ne', 'e', 'se', 's', 'sw', 'w', 'nw', and 'c'.
+            grid.pack(create_button(), 1, 1, max_height=25, anchor="w")  # west (centered)
+            grid.pack(create_button(), 1, 1, max_width=25, anchor="n")   # north (centered)
+            grid.pack(create_button(), 4, 4, max_height=25, anchor="w")
+
+            # These items will occupy a range of cells.
+            grid.pack(create_button(),  3,  1,  4,  2)
+            grid.pack(create_button(),  1,  3,  2,  4)
+            grid.pack(create_button(),  4,  0, -1,  1)
+            grid.pack(create_button(),  0,  4,  1, -1)
+
+            for anchor in grid.ANCHORS:  # '
+                kwargs = dict(max_width=50, max_height=50, anchor=anchor)
+                # pack to individual cells (cont.)
+                grid.pack(create_button(),  0,  0, **kwargs)  # first row & column
+                grid.pack(create_button(), -1, -1, **kwargs)  # last row & column
+                # pack to a "merged cell" (cont.)
+                grid.pack(create_button(),  2,  2,  3,  3, **kwargs)
+
+            # You can change the weight or set a fixed size for a row/column.
+            grid.configure_col(2, weight=0.5)  # |
+            grid.configure_col(3, weight=0.5)  # |-- These middle rows and columns will scale
+            grid.configure_row(2, weight=0.5)  # |-- to half the size of other rows/columns.
+            grid.configure_row(3, weight=0.5)  # |
 
     dpg.set_primary_window(win, True)
     dpg.show_viewport()
     # Be sure to add the grid's redraw method to a callback. Otherwise it won't resize!
-    dpg.set_viewport_resize_callback(grid.redraw)
+    # The target is the primary window, so the viewport's own size can be used.
+    dpg.set_viewport_resize_callback(grid.redraw_viewport)
 
 
     while dpg.is_dearpygui_running():